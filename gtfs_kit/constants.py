@@ -111,6 +111,9 @@ STR_COLS = GTFS_REF.loc[GTFS_REF["dtype"] == "str", "column"].values.tolist()
 
 DTYPE = {col: str for col in STR_COLS}
 
+#: Number of rows to write at a time when outputting a GTFS table
+WRITE_CHUNKSIZE = 200_000
+
 #: Valid distance units
 DIST_UNITS = ["ft", "mi", "m", "km"]
 
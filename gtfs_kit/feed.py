@@ -16,13 +16,16 @@ parameter in the method signatures.
 Ignore that extra parameter; it refers to the Feed instance,
 usually called ``self`` and usually hidden automatically by Sphinx.
 """
+import io
+import os
+import re
+import stat
 from pathlib import Path
 import tempfile
-import shutil
-from copy import deepcopy
 import zipfile
-from typing import Optional, Union
+from typing import FrozenSet, Optional, TextIO, Union
 
+import numpy as np
 import pandas as pd
 from pandas.core.frame import DataFrame
 import requests
@@ -32,6 +35,11 @@ from . import helpers as hp
 from . import cleaners as cn
 
 
+# GTFS table names and integer columns, computed once rather than per call
+_GTFS_TABLES = tuple(cs.GTFS_REF["table"].unique())
+_INT_COLS_FS = frozenset(cs.INT_COLS)
+
+
 class Feed(object):
     """
     An instance of this class represents a not-necessarily-valid GTFS feed,
@@ -76,6 +84,9 @@ class Feed(object):
     The first way ensures that the altered trips DataFrame is saved as
     the new ``trips`` attribute, but the second way does not.
 
+    Feeds have no instance attributes other than the ones above,
+    so you can't set arbitrary attributes on them.
+
     """
 
     # Import heaps of methods from modules split by functionality;
@@ -171,6 +182,32 @@ class Feed(object):
         drop_invalid_columns,
     )
 
+    # Declare the instance attributes to save memory and speed up access.
+    # Primary attributes with setters are stored under underscored names.
+    __slots__ = (
+        "_dist_units",
+        "agency",
+        "stops",
+        "routes",
+        "_trips",
+        "_trips_i",
+        "stop_times",
+        "_calendar",
+        "_calendar_i",
+        "_calendar_dates",
+        "_calendar_dates_g_cache",
+        "fare_attributes",
+        "fare_rules",
+        "shapes",
+        "frequencies",
+        "transfers",
+        "feed_info",
+    )
+
+    # Primary attributes other than the distance units, in
+    # ``cs.FEED_ATTRS_1`` order, computed once for :meth:`__eq__` and :meth:`copy`
+    _FEED_ATTRS_1_EX_DU = tuple(a for a in cs.FEED_ATTRS_1 if a != "dist_units")
+
     def __init__(
         self,
         dist_units: str,
@@ -200,9 +237,20 @@ class Feed(object):
         # Set primary attributes from inputs.
         # The @property magic below will then
         # validate some and set some derived attributes
-        for prop, val in locals().items():
-            if prop in cs.FEED_ATTRS_1:
-                setattr(self, prop, val)
+        self.dist_units = dist_units
+        self.agency = agency
+        self.stops = stops
+        self.routes = routes
+        self.trips = trips
+        self.stop_times = stop_times
+        self.calendar = calendar
+        self.calendar_dates = calendar_dates
+        self.fare_attributes = fare_attributes
+        self.fare_rules = fare_rules
+        self.shapes = shapes
+        self.frequencies = frequencies
+        self.transfers = transfers
+        self.feed_info = feed_info
 
     @property
     def dist_units(self):
@@ -234,7 +282,12 @@ class Feed(object):
         """
         self._trips = val
         if val is not None and not val.empty:
-            self._trips_i = self._trips.set_index("trip_id")
+            # Index a shallow copy instead of calling ``set_index``,
+            # which would copy all the data.
+            # Copy the index values though, so that editing the
+            # trips table in place can't corrupt the index.
+            self._trips_i = val.copy(deep=False)
+            self._trips_i.index = pd.Index(val["trip_id"], copy=True)
         else:
             self._trips_i = None
 
@@ -252,7 +305,12 @@ class Feed(object):
         """
         self._calendar = val
         if val is not None and not val.empty:
-            self._calendar_i = self._calendar.set_index("service_id")
+            # Index a shallow copy instead of calling ``set_index``,
+            # which would copy all the data.
+            # Copy the index values though, so that editing the
+            # calendar table in place can't corrupt the index.
+            self._calendar_i = val.copy(deep=False)
+            self._calendar_i.index = pd.Index(val["service_id"], copy=True)
         else:
             self._calendar_i = None
 
@@ -266,27 +324,36 @@ class Feed(object):
     @calendar_dates.setter
     def calendar_dates(self, val):
         """
-        Update ``self._calendar_dates_g``
+        Reset ``self._calendar_dates_g``
         if ``self.calendar_dates`` changes.
         """
         self._calendar_dates = val
-        if val is not None and not val.empty:
-            self._calendar_dates_g = self._calendar_dates.groupby(
-                ["service_id", "date"]
-            )
-        else:
-            self._calendar_dates_g = None
+        self._calendar_dates_g_cache = None
+
+    @property
+    def _calendar_dates_g(self):
+        """
+        The calendar_dates table of this Feed grouped by service ID and
+        date, or ``None`` if that table is missing or empty.
+        Build the grouping on first access, since many workflows never
+        use it, and cache it until ``self.calendar_dates`` changes.
+        """
+        if self._calendar_dates_g_cache is None:
+            f = self._calendar_dates
+            if f is not None and not f.empty:
+                self._calendar_dates_g_cache = f.groupby(
+                    ["service_id", "date"], sort=False
+                )
+        return self._calendar_dates_g_cache
 
     def __str__(self):
         """
         Print the first five rows of each GTFS table.
         """
         d = {}
-        for table in cs.GTFS_REF["table"].unique():
-            try:
-                d[table] = getattr(self, table).head(5)
-            except:
-                d[table] = None
+        for table in _GTFS_TABLES:
+            f = getattr(self, table, None)
+            d[table] = None if f is None else f.head(5)
         d["dist_units"] = self.dist_units
 
         return "\n".join([f"* {k} --------------------\n\t{v}" for k, v in d.items()])
@@ -300,13 +367,23 @@ class Feed(object):
         Almost equality is checked via :func:`.helpers.almost_equal`,
         which   canonically sorts DataFrame rows and columns.
         """
-        # Return False if failures
-        for key in cs.FEED_ATTRS_1:
+        # Return False if failures, checking the cheap things first
+        if self.dist_units != other.dist_units:
+            return False
+
+        for key in Feed._FEED_ATTRS_1_EX_DU:
             x = getattr(self, key)
             y = getattr(other, key)
             # DataFrame case
             if isinstance(x, pd.DataFrame):
-                if not isinstance(y, pd.DataFrame) or not hp.almost_equal(x, y):
+                if (
+                    not isinstance(y, pd.DataFrame)
+                    # Almost equal DataFrames have the same shape and
+                    # column dtypes, so skip sorting them if those differ
+                    or x.shape != y.shape
+                    or dict(x.dtypes) != dict(y.dtypes)
+                    or not hp.almost_equal(x, y)
+                ):
                     return False
             # Other case
             else:
@@ -321,15 +398,13 @@ class Feed(object):
         attributes.
         """
         other = Feed(dist_units=self.dist_units)
-        for key in set(cs.FEED_ATTRS) - set(["dist_units"]):
+        # Only copy the primary attributes;
+        # their setters rebuild the secondary attributes from the copies
+        for key in Feed._FEED_ATTRS_1_EX_DU:
             value = getattr(self, key)
             if isinstance(value, pd.DataFrame):
                 # Pandas copy DataFrame
                 value = value.copy()
-            elif isinstance(value, pd.core.groupby.DataFrameGroupBy):
-                # Pandas does not have a copy method for groupby objects
-                # as far as i know
-                value = deepcopy(value)
             setattr(other, key, value)
 
         return other
@@ -346,37 +421,39 @@ class Feed(object):
         """
         path = Path(path)
 
-        if path.suffix == ".zip":
-            # Write to temporary directory before zipping
-            zipped = True
-            tmp_dir = tempfile.TemporaryDirectory()
-            new_path = Path(tmp_dir.name)
-        else:
-            zipped = False
-            if not path.exists():
-                path.mkdir()
-            new_path = path
-
-        for table in cs.GTFS_REF["table"].unique():
+        tables = []
+        for table in _GTFS_TABLES:
             f = getattr(self, table)
             if f is None:
                 continue
 
-            f = f.copy()
             # Some columns need to be output as integers.
             # If there are NaNs in any such column,
             # then Pandas will format the column as float, which we don't want.
-            f_int_cols = set(cs.INT_COLS) & set(f.columns)
-            for s in f_int_cols:
-                f[s] = f[s].fillna(-1).astype(int).astype(str).replace("-1", "")
-            p = new_path / (table + ".txt")
-            f.to_csv(str(p), index=False, float_format=f"%.{ndigits}f")
+            # Columns of integer dtype already get output as integers.
+            f_int_cols = frozenset(
+                s
+                for s in _INT_COLS_FS.intersection(f.columns)
+                if not pd.api.types.is_integer_dtype(f[s])
+            )
+            tables.append((table, f, f_int_cols))
+
+        if path.suffix == ".zip":
+            # Stream tables straight into the zip archive.
+            # Force ZIP64 extensions, because the size of each file is
+            # unknown in advance and the stop times file can exceed 2 GiB.
+            with zipfile.ZipFile(str(path), "w", zipfile.ZIP_DEFLATED) as dst:
+                for table, f, f_int_cols in tables:
+                    with dst.open(table + ".txt", "w", force_zip64=True) as raw:
+                        out = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+                        with out:
+                            _write_table_to_buffer(f, out, f_int_cols, ndigits)
+        else:
+            if not path.exists():
+                path.mkdir()
 
-        # Zip directory
-        if zipped:
-            basename = str(path.parent / path.stem)
-            shutil.make_archive(basename, format="zip", root_dir=tmp_dir.name)
-            tmp_dir.cleanup()
+            for table, f, f_int_cols in tables:
+                _write_table(f, path / (table + ".txt"), f_int_cols, ndigits)
 
 
 # -------------------------------------
@@ -395,27 +472,94 @@ def list_feed(path: Path) -> DataFrame:
     if not path.exists():
         raise ValueError(f"Path {path} does not exist")
 
-    # Collect rows of DataFrame
-    rows = []
+    # Collect columns of DataFrame
+    names = []
+    sizes = []
     if path.is_file():
         # Zip file
         with zipfile.ZipFile(str(path)) as src:
             for x in src.infolist():
                 if x.filename == "./":
                     continue
-                d = {}
-                d["file_name"] = x.filename
-                d["file_size"] = x.file_size
-                rows.append(d)
+                names.append(x.filename)
+                sizes.append(x.file_size)
     else:
-        # Directory
-        for x in path.iterdir():
-            d = {}
-            d["file_name"] = x.name
-            d["file_size"] = x.stat().st_size
-            rows.append(d)
+        # Directory; scandir entries cache their stat results
+        with os.scandir(str(path)) as it:
+            for x in it:
+                names.append(x.name)
+                sizes.append(x.stat().st_size)
 
-    return pd.DataFrame(rows)
+    return pd.DataFrame({"file_name": names, "file_size": sizes}, copy=False)
+
+
+def _format_int_col(s: pd.Series) -> np.ndarray:
+    """
+    Helper function for :func:`_write_table_to_buffer`.
+    Format the given Series of integers, possibly stored as floats or
+    objects, as strings of integers, and format its NaNs as empty strings.
+    Return the result as a NumPy object array.
+    """
+    values = s.to_numpy()
+    mask = pd.isna(values)
+    out = np.full(values.shape, "", dtype=object)
+    out[~mask] = values[~mask].astype(np.int64).astype(str)
+    return out
+
+
+def _write_table_to_buffer(
+    f: DataFrame, out: TextIO, int_cols: FrozenSet[str], ndigits: int
+) -> None:
+    """
+    Helper function for :meth:`Feed.write`.
+    Write the given GTFS table to the given text buffer in CSV format,
+    formatting the given columns as integers and rounding all other
+    decimals to ``ndigits`` decimal places.
+    Write in chunks of :const:`.constants.WRITE_CHUNKSIZE` rows,
+    formatting the integer columns of a copy of each chunk rather than of
+    a copy of the whole table, and copying nothing if there are no
+    integer columns to format.
+    """
+    float_format = f"%.{ndigits}f"
+    if not int_cols:
+        # Nothing to format, so let Pandas write the table in chunks itself
+        f.to_csv(
+            out, index=False, float_format=float_format, chunksize=cs.WRITE_CHUNKSIZE
+        )
+        return
+
+    for start in range(0, max(f.shape[0], 1), cs.WRITE_CHUNKSIZE):
+        g = f.iloc[start : start + cs.WRITE_CHUNKSIZE].copy()
+        for s in int_cols:
+            g[s] = _format_int_col(g[s])
+        g.to_csv(out, index=False, header=start == 0, float_format=float_format)
+
+
+def _write_table(
+    f: DataFrame, path: Path, int_cols: FrozenSet[str], ndigits: int
+) -> None:
+    """
+    Helper function for :meth:`Feed.write`.
+    Write the given GTFS table to the given path as a CSV file
+    via :func:`_write_table_to_buffer`.
+    """
+    with Path(path).open("w", encoding="utf-8", newline="") as out:
+        _write_table_to_buffer(f, out, int_cols, ndigits)
+
+
+def _read_table(src) -> Optional[DataFrame]:
+    """
+    Helper function for :func:`_read_feed_from_path`.
+    Read the GTFS text file at the given path or binary file object
+    into a DataFrame, strip whitespace from its column names,
+    and return the result, or ``None`` if the file has no data.
+    """
+    # utf-8-sig gets rid of the byte order mark (BOM);
+    # see http://stackoverflow.com/questions/17912307/u-ufeff-in-python-string
+    df = pd.read_csv(src, dtype=cs.DTYPE, encoding="utf-8-sig")
+    if df.empty:
+        return None
+    return cn.clean_column_names(df)
 
 
 def _read_feed_from_path(path: Path, dist_units: str) -> "Feed":
@@ -434,42 +578,45 @@ def _read_feed_from_path(path: Path, dist_units: str) -> "Feed":
 
     """
     path = Path(path)
-    if not path.exists():
+    try:
+        mode = path.stat().st_mode
+    except OSError:
         raise ValueError(f"Path {path} does not exist")
 
-    # Unzip path to temporary directory if necessary
-    if path.is_file():
-        zipped = True
-        tmp_dir = tempfile.TemporaryDirectory()
-        src_path = Path(tmp_dir.name)
-        shutil.unpack_archive(str(path), tmp_dir.name, "zip")
-    else:
-        zipped = False
-        src_path = path
-
     # Read files into feed dictionary of DataFrames
-    feed_dict = {table: None for table in cs.GTFS_REF["table"]}
-    for p in src_path.iterdir():
-        table = p.stem
-        # Skip empty files, irrelevant files, and files with no data
-        if (
-            p.is_file()
-            and p.stat().st_size
-            and p.suffix == ".txt"
-            and table in feed_dict
-        ):
-            # utf-8-sig gets rid of the byte order mark (BOM);
-            # see http://stackoverflow.com/questions/17912307/u-ufeff-in-python-string
-            df = pd.read_csv(p, dtype=cs.DTYPE, encoding="utf-8-sig")
-            if not df.empty:
-                feed_dict[table] = cn.clean_column_names(df)
+    feed_dict = {table: None for table in _GTFS_TABLES}
+    if stat.S_ISREG(mode):
+        # Read files directly from the zip archive without unzipping it
+        with zipfile.ZipFile(str(path)) as src:
+            for x in src.infolist():
+                p = Path(x.filename)
+                table = p.stem
+                # Skip directories, nested files, empty files, and irrelevant files
+                if (
+                    not x.is_dir()
+                    and p.parent == Path(".")
+                    and x.file_size
+                    and p.suffix == ".txt"
+                    and table in feed_dict
+                ):
+                    with src.open(x) as f:
+                        feed_dict[table] = _read_table(f)
+    elif stat.S_ISDIR(mode):
+        for p in path.iterdir():
+            table = p.stem
+            # Skip empty files, irrelevant files, and files with no data
+            if (
+                p.is_file()
+                and p.stat().st_size
+                and p.suffix == ".txt"
+                and table in feed_dict
+            ):
+                feed_dict[table] = _read_table(p)
+    else:
+        raise ValueError(f"Path {path} is not a file or directory")
 
     feed_dict["dist_units"] = dist_units
 
-    # Delete temporary directory
-    if zipped:
-        tmp_dir.cleanup()
-
     # Create feed
     return Feed(**feed_dict)
 
@@ -487,21 +634,27 @@ def _read_feed_from_url(url: str, dist_units: str) -> "Feed":
 
 
     """
-    f = tempfile.NamedTemporaryFile(delete=False)
-    with requests.get(url) as r:
-        f.write(r._content)
-    f.close()
-    feed = _read_feed_from_path(f.name, dist_units=dist_units)
-    Path(f.name).unlink()
+    # Stream the download to disk in 1 MiB chunks rather than holding
+    # the whole response in memory.
+    # Close the file before reading it, so that it can be reopened on Windows.
+    f = tempfile.NamedTemporaryFile(suffix=".zip", delete=False)
+    try:
+        with f, requests.get(url, stream=True) as r:
+            r.raise_for_status()
+            for chunk in r.iter_content(chunk_size=1 << 20):
+                f.write(chunk)
+        feed = _read_feed_from_path(f.name, dist_units=dist_units)
+    finally:
+        Path(f.name).unlink()
     return feed
 
 
 def read_feed(path_or_url: Union[Path, str], dist_units: str) -> "Feed":
     """
     Create a Feed instance from the given path or URL and given distance units.
-    If the path exists, then call :func:`_read_feed_from_path`.
-    Else if the URL has OK status according to Requests, then call
-    :func:`_read_feed_from_url`.
+    If the given string is an HTTP(S) URL with OK status according
+    to Requests, then call :func:`_read_feed_from_url`.
+    Else if the path exists, then call :func:`_read_feed_from_path`.
     Else raise a ValueError.
 
     Notes:
@@ -510,13 +663,12 @@ def read_feed(path_or_url: Union[Path, str], dist_units: str) -> "Feed":
     - Automatically strip whitespace from the column names in GTFS files
 
     """
-    try:
-        path_exists = Path(path_or_url).exists()
-    except OSError:
-        path_exists = False
-    if path_exists:
-        return _read_feed_from_path(path_or_url, dist_units=dist_units)
-    elif requests.head(path_or_url).ok:
-        return _read_feed_from_url(path_or_url, dist_units=dist_units)
+    # Only send HEAD requests for URLs, not for arbitrary strings
+    if isinstance(path_or_url, str) and re.match(r"https?://", path_or_url, re.I):
+        if requests.head(path_or_url).ok:
+            return _read_feed_from_url(path_or_url, dist_units=dist_units)
+        else:
+            raise ValueError("URL has bad status.")
     else:
-        raise ValueError("Path does not exist or URL has bad status.")
+        # Raises a ValueError if the path does not exist
+        return _read_feed_from_path(path_or_url, dist_units=dist_units)
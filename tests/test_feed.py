@@ -1,9 +1,15 @@
 import pytest
 from pathlib import Path
+import tempfile
+import shutil
+import zipfile
+import types
+import pickle
 
 import pandas as pd
 from pandas.testing import assert_frame_equal
 import numpy as np
+import requests
 
 from .context import gtfs_kit, DATA_DIR
 from gtfs_kit import *
@@ -21,6 +27,51 @@ def test_feed():
             assert val is None
 
 
+def test_trips_i():
+    feed = read_feed(DATA_DIR / "sample_gtfs.zip", dist_units="km")
+    trip_id = feed.trips["trip_id"].iat[0]
+    assert feed._trips_i.at[trip_id, "service_id"] == feed.trips["service_id"].iat[0]
+
+    # Editing trips in place should not corrupt the index
+    feed.trips.loc[0, "trip_id"] = "NEW"
+    assert feed._trips_i.index[0] == trip_id
+    assert feed._trips_i.at[trip_id, "service_id"] == feed.trips["service_id"].iat[0]
+
+
+def test_slots():
+    feed = read_feed(DATA_DIR / "sample_gtfs.zip", dist_units="km")
+    assert not hasattr(feed, "__dict__")
+    with pytest.raises(AttributeError):
+        feed.bingo = 1
+
+    # Pickling should still work
+    feed2 = pickle.loads(pickle.dumps(feed))
+    assert feed2 == feed
+    assert feed2._trips_i.equals(feed._trips_i)
+
+
+def test_calendar_dates_g():
+    feed = read_feed(DATA_DIR / "sample_gtfs.zip", dist_units="km")
+    g1 = feed._calendar_dates_g
+    assert isinstance(g1, pd.core.groupby.DataFrameGroupBy)
+    # Should be cached
+    assert feed._calendar_dates_g is g1
+
+    # Should be rebuilt when calendar_dates changes
+    f = feed.calendar_dates.iloc[:1].copy()
+    feed.calendar_dates = f
+    g2 = feed._calendar_dates_g
+    assert g2 is not g1
+    key = tuple(f[["service_id", "date"]].iloc[0])
+    assert list(g2.groups) == [key]
+
+    # Should be None for empty or missing tables
+    feed.calendar_dates = f.iloc[:0]
+    assert feed._calendar_dates_g is None
+    feed.calendar_dates = None
+    assert feed._calendar_dates_g is None
+
+
 def test_str():
     assert isinstance(str(feed), str)
 
@@ -51,6 +102,15 @@ def test_eq():
     feed2 = Feed(dist_units="mi", stops=feed1.stops)
     assert feed1 != feed2
 
+    feed2 = Feed(
+        dist_units="m",
+        stops=pd.DataFrame([[1, 2], [3, 4], [5, 6]], columns=["a", "b"]),
+    )
+    assert feed1 != feed2
+
+    feed2 = Feed(dist_units="m", stops=feed1.stops.astype(float))
+    assert feed1 != feed2
+
 
 def test_copy():
     feed1 = read_feed(DATA_DIR / "sample_gtfs.zip", dist_units="km")
@@ -83,7 +143,7 @@ def test_list_feed():
         assert f.shape[0] in [12, 13]
 
 
-def test_read_feed():
+def test_read_feed(monkeypatch):
     # Bad path
     with pytest.raises(ValueError):
         read_feed("bad_path!", dist_units="km")
@@ -105,8 +165,23 @@ def test_read_feed():
     # Feed should have None feed_info table
     assert feed.feed_info is None
 
+    # Only HTTP(S) URLs, in any case, should get requested
+    requested = []
 
-def test_write():
+    def head(url):
+        requested.append(url)
+        return types.SimpleNamespace(ok=False)
+
+    monkeypatch.setattr(requests, "head", head)
+    for url in ["HTTPS://example.com/feed.zip", "http://example.com/feed.zip"]:
+        with pytest.raises(ValueError):
+            read_feed(url, dist_units="km")
+    with pytest.raises(ValueError):
+        read_feed("ftp://example.com/feed.zip", dist_units="km")
+    assert requested == ["HTTPS://example.com/feed.zip", "http://example.com/feed.zip"]
+
+
+def test_write(monkeypatch):
     feed1 = read_feed(DATA_DIR / "sample_gtfs.zip", dist_units="km")
 
     # Export feed1, import it as feed2, and then test equality
@@ -139,3 +214,28 @@ def test_write():
     assert t[~t["direction_id"].isin([np.nan, "0", "1"])].empty
     tmp_dir.cleanup()
     q.unlink()
+
+    # Test that tables spanning several chunks get written properly,
+    # that NaNs in integer columns get output as empty strings,
+    # and that genuine -1 values are kept
+    monkeypatch.setattr(cs, "WRITE_CHUNKSIZE", 3)
+    feed4 = read_feed(DATA_DIR / "sample_gtfs.zip", dist_units="km")
+    f = feed4.trips.copy()
+    n = f.shape[0]
+    f["direction_id"] = ([np.nan, 1, 0, -1] * n)[:n]
+    feed4.trips = f
+    expect = (["", "1", "0", "-1"] * n)[:n]
+    for out_path in [DATA_DIR / "bingo.zip", DATA_DIR / "bingo"]:
+        feed4.write(out_path)
+        feed5 = read_feed(out_path, "km")
+        assert feed4 == feed5
+        if out_path.suffix == ".zip":
+            with zipfile.ZipFile(out_path) as z, z.open("trips.txt") as src:
+                t = pd.read_csv(src, dtype={"direction_id": str})
+        else:
+            t = pd.read_csv(out_path / "trips.txt", dtype={"direction_id": str})
+        assert t["direction_id"].fillna("").tolist() == expect
+        try:
+            out_path.unlink()
+        except:
+            shutil.rmtree(str(out_path))